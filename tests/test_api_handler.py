@@ -0,0 +1,95 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from utils.api_handler import enrich_sales_data, generate_sales_report
+from utils.file_handler import parse_transactions
+
+
+PRODUCT_MAPPING = {
+    0: {'title': 'Product 0', 'category': 'zero', 'brand': 'Brand0', 'rating': 1.0},
+    1: {'title': 'Product 1', 'category': 'one', 'brand': 'Brand1', 'rating': 2.0},
+    101: {'title': 'Product 101', 'category': 'laptops', 'brand': 'Apple', 'rating': 4.7},
+    110: {'title': 'Product 110', 'category': 'mice', 'brand': 'Logitech', 'rating': 4.2},
+}
+
+RAW_LINES = [
+    'T001|2024-12-01|P101|Laptop|2|45000|C001|North',
+    'T002|2024-12-01|P110|Mouse|5|500|C002|South',
+    'T003|2024-12-02|P999|Webcam|1|3000|C001|North',
+    'T004|2024-12-02|X101|Keyboard|3|1200|C003|East',
+]
+
+
+class EnrichmentTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # enrich_sales_data() also saves to data/enriched_sales_data.txt
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        os.makedirs(os.path.join(directory.name, 'data'))
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory.name)
+
+    def enrich(self, transactions):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return enrich_sales_data(transactions, PRODUCT_MAPPING)
+
+
+class EnrichSalesDataTest(EnrichmentTestCase):
+
+    def test_looks_up_the_whole_numeric_id(self):
+        # lstrip('P1') used to turn P101 into 1 and P110 into 0
+        enriched = self.enrich(parse_transactions(RAW_LINES[:2]))
+        self.assertEqual([t['API_Category'] for t in enriched], ['laptops', 'mice'])
+        self.assertEqual([t['API_Match'] for t in enriched], [True, True])
+
+    def test_unknown_or_malformed_ids_do_not_match(self):
+        transactions = [{'ProductID': product_id} for product_id in ('P999', 'X101', 'P1.0', 'P', '')]
+        for transaction in self.enrich(transactions):
+            self.assertEqual(transaction['API_Match'], False, transaction['ProductID'])
+            self.assertIsNone(transaction['API_Category'])
+            self.assertIsNone(transaction['API_Brand'])
+            self.assertIsNone(transaction['API_Rating'])
+
+    def test_keeps_the_callers_keys_and_types(self):
+        transactions = [
+            {'TransactionID': 'T001', 'ProductID': 'P101', 'Quantity': 2, 'UnitPrice': 1.0},
+            {'TransactionID': 'T002', 'ProductID': 'P110', 'UnitPrice': 1.0},
+        ]
+        enriched = self.enrich(transactions)
+        api_keys = {'API_Category', 'API_Brand', 'API_Rating', 'API_Match'}
+        for original, transaction in zip(transactions, enriched):
+            self.assertEqual(set(transaction) - api_keys, set(original))
+        self.assertIs(type(enriched[0]['Quantity']), int)
+        self.assertNotIn('API_Match', transactions[0])
+
+    def test_saved_file_keeps_field_count(self):
+        transactions = [{'TransactionID': 'T001', 'ProductID': 'P101', 'ProductName': 'a|b\\c'}]
+        self.enrich(transactions)
+        with open(os.path.join('data', 'enriched_sales_data.txt'), encoding='utf-8') as file:
+            header, row = file.read().splitlines()
+        self.assertEqual(len(row.split('|')), len(header.split('|')))
+        self.assertIn('a b\\c', row.split('|'))
+
+
+class EnrichmentSummaryTest(EnrichmentTestCase):
+
+    def test_lists_products_that_could_not_be_enriched(self):
+        transactions = parse_transactions(RAW_LINES)
+        enriched = self.enrich(transactions)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_sales_report(transactions, enriched, output_file='report.txt')
+        with open('report.txt', encoding='utf-8') as file:
+            report = file.read()
+
+        summary = report.split('API ENRICHMENT SUMMARY', 1)[1]
+        failed = summary.split("Products that couldn't be enriched:", 1)[1].split()
+        self.assertIn('Successful Enrichment Rate: 50.00%', summary)
+        self.assertEqual(failed, ['-', 'P999', '-', 'X101'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from utils.file_handler import load_transactions, parse_transactions
+
+
+HEADER = 'TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region'
+GOOD_ROW = 'T001|2024-12-01|P101|Monitor,4K|2|1,500|C001|North'
+
+
+class ParseTransactionsTest(unittest.TestCase):
+
+    def parse(self, *rows):
+        return parse_transactions(list(rows))
+
+    def test_parses_a_valid_row(self):
+        [transaction] = self.parse(GOOD_ROW)
+        self.assertEqual(transaction, {
+            'TransactionID': 'T001',
+            'Date': '2024-12-01',
+            'ProductID': 'P101',
+            'ProductName': 'Monitor 4K',
+            'Quantity': 2,
+            'UnitPrice': 1500.0,
+            'CustomerID': 'C001',
+            'Region': 'North',
+            'Amount': 3000.0
+        })
+
+    def test_skips_rows_with_missing_fields(self):
+        transactions = self.parse('T002|2024-12-01|P101|Laptop|2|45000|C001', GOOD_ROW)
+        self.assertEqual([t['TransactionID'] for t in transactions], ['T001'])
+
+    def test_skips_rows_with_extra_fields(self):
+        transactions = self.parse('T002|2024-12-01|P101|Laptop|2|45000|C001|North|X', GOOD_ROW)
+        self.assertEqual([t['TransactionID'] for t in transactions], ['T001'])
+
+    def test_rejects_non_integer_quantity(self):
+        self.assertEqual(self.parse('T002|2024-12-01|P101|Laptop|1.0|45000|C001|North'), [])
+
+    def test_keeps_quantities_beyond_int32(self):
+        [transaction] = self.parse('T002|2024-12-01|P101|Laptop|3,000,000,000|2|C001|North')
+        self.assertEqual(transaction['Quantity'], 3_000_000_000)
+        self.assertEqual(transaction['Amount'], 6_000_000_000.0)
+
+
+class LoadTransactionsTest(unittest.TestCase):
+
+    def load(self, *rows):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'sales_data.txt')
+            with open(filename, 'w', encoding='cp1252') as file:
+                file.write('\n'.join((HEADER,) + rows) + '\n')
+            return load_transactions(filename)
+
+    def test_matches_parse_transactions(self):
+        rows = (
+            GOOD_ROW,
+            'T002|2024-12-01|P101|Laptop|2|45000|C001',
+            '',
+            'T003|2024-12-02|P102|Mouse|1.0|500|C002|South',
+            'T004|2024-12-02|P102|Mouse|3|500|C002|',
+            'T005|2024-12-03|P103|Webcam|x|500|C003|East',
+        )
+        df = self.load(*rows)
+        self.assertEqual(df.astype(object).to_dict('records'), parse_transactions(list(rows)))
+
+    def test_skips_rows_with_missing_fields(self):
+        df = self.load('T002|2024-12-01|P101|Laptop|2|45000|C001', GOOD_ROW)
+        self.assertEqual(list(df['TransactionID']), ['T001'])
+
+    def test_keeps_empty_trailing_field(self):
+        df = self.load('T002|2024-12-01|P101|Laptop|2|45000|C001|')
+        self.assertEqual(list(df['Region']), [''])
+
+    def test_rejects_non_integer_quantity(self):
+        self.assertEqual(len(self.load('T002|2024-12-01|P101|Laptop|1.0|45000|C001|North')), 0)
+
+    def test_keeps_quantities_beyond_int32(self):
+        df = self.load('T002|2024-12-01|P101|Laptop|3,000,000,000|2|C001|North')
+        self.assertEqual(str(df['Quantity'].dtype), 'int64')
+        self.assertEqual(df['Quantity'].tolist(), [3_000_000_000])
+
+    def test_skips_quantities_beyond_int64(self):
+        self.assertEqual(len(self.load('T002|2024-12-01|P101|Laptop|99999999999999999999|2|C001|North')), 0)
+
+    def test_missing_file_returns_empty_frame(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = load_transactions(os.path.join(tempfile.gettempdir(), 'no_such_sales_data.txt'))
+        self.assertTrue(df.empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,51 @@
+import csv
+import io
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import numpy as np
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+from utils.data_processor import calculate_total_revenue, customer_analysis, daily_sales_trend, find_peak_sales_day, prepare_transactions, product_rankings, region_wise_sales, sales_date_range
+
+# Shared session so repeated API calls reuse the pooled keep-alive connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+_PRODUCTS_URL = "https://dummyjson.com/products"
+_PAGE_SIZE = 100
+_MAX_PAGE_WORKERS = 8
+
+# csv.writer prefixes '|' and '\n' inside a value, and this character itself,
+# with _FIELD_ESCAPE; _write_enriched_csv() turns those and any '\r' into spaces
+_FIELD_ESCAPE = '\x1e'
+_ESCAPED_FIELD = re.compile('\x1e([\x1e|\n])|\r')
+
+# Products from the last successful fetch are reused for this many seconds
+_PRODUCTS_TTL = 300
+_PRODUCTS_CACHE = {'products': None, 'fetched_at': 0.0}
+
+
+def _fetch_page(skip):
+    response = _SESSION.get(_PRODUCTS_URL, params={'limit': _PAGE_SIZE, 'skip': skip}, timeout=(3.05, 10))
+    response.raise_for_status()
+    return _json.loads(response.content)
+
 
-from utils.data_processor import calculate_total_revenue, customer_analysis, daily_sales_trend, find_peak_sales_day, low_performing_products, region_wise_sales, top_selling_products
 def fetch_all_products():
     """
     Fetches all products from DummyJSON API
@@ -22,22 +66,35 @@ def fetch_all_products():
     ]
 
     Requirements:
-    - Fetch all available products (use limit=100)
+    - Fetch all available products (pages of limit=100; pages after the
+      first are fetched concurrently over the shared session)
     - Handle connection errors with try-except
     - Return empty list if API fails
     - Print status message (success/failure)
+
+    A successful result is cached for _PRODUCTS_TTL seconds and the same
+    list object is returned on repeat calls, so treat it as read-only.
+    Failures are not cached.
     """
 
-   
+    cached = _PRODUCTS_CACHE['products']
+    if cached is not None and time.monotonic() - _PRODUCTS_CACHE['fetched_at'] < _PRODUCTS_TTL:
+        return cached
 
-    url = "https://dummyjson.com/products?limit=100"
     try:
-        response = requests.get(url)
-        data = response.json()
+        data = _fetch_page(0)
         products = data.get('products', [])
+        remaining_pages = range(_PAGE_SIZE, data.get('total', len(products)), _PAGE_SIZE)
+        if remaining_pages:
+            with ThreadPoolExecutor(max_workers=_MAX_PAGE_WORKERS) as executor:
+                for page in executor.map(_fetch_page, remaining_pages):
+                    products.extend(page.get('products', []))
         print(f"Successfully fetched {len(products)} products.")
+        if products:
+            _PRODUCTS_CACHE['products'] = products
+            _PRODUCTS_CACHE['fetched_at'] = time.monotonic()
         return products
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"Failed to fetch products: {e}")
         return []
     
@@ -74,6 +131,61 @@ def create_product_mapping(api_products):
             continue
     return product_mapping
 
+# Product info laid out column-wise, each array indexed by the numeric product ID
+_ProductArrays = namedtuple('_ProductArrays', ['category', 'brand', 'rating', 'match'])
+
+
+def _product_arrays(product_mapping):
+    ids = np.fromiter(product_mapping.keys(), dtype=np.int64, count=len(product_mapping))
+    size = int(ids.max()) + 1 if len(ids) else 1
+    infos = list(product_mapping.values())
+
+    category = np.full(size, None, dtype=object)
+    brand = np.full(size, None, dtype=object)
+    rating = np.full(size, None, dtype=object)
+    match = np.zeros(size, dtype=bool)
+
+    category[ids] = [info['category'] for info in infos]
+    brand[ids] = [info['brand'] for info in infos]
+    rating[ids] = [info['rating'] for info in infos]
+    match[ids] = True
+
+    return _ProductArrays(category, brand, rating, match)
+
+
+def _enrich_transactions(transactions, product_mapping):
+    # Each distinct ProductID is resolved once; codes map the rows back to it
+    codes, product_ids = pd.factorize(
+        np.array([str(t.get('ProductID', '')) for t in transactions], dtype=object)
+    )
+    product_ids = pd.Series(product_ids, dtype=object)
+
+    # Only 'P' followed by digits is looked up (P101 -> 101); other IDs such
+    # as 'X5' or 'P5.0' never match
+    pids = pd.to_numeric(product_ids.str.slice(1), errors='coerce')
+
+    arrays = _product_arrays(product_mapping)
+    size = len(arrays.match)
+
+    known = (product_ids.str.fullmatch(r'P\d+').fillna(False).astype(bool) &
+             pids.between(0, size - 1)).to_numpy(dtype=bool)
+    idx = np.where(known, pids.fillna(0), 0).astype(np.int64)
+    matched = (known & arrays.match[idx])[codes]
+    idx = idx[codes]
+
+    category = np.where(matched, arrays.category[idx], None)
+    brand = np.where(matched, arrays.brand[idx], None)
+    rating = np.where(matched, arrays.rating[idx], None)
+
+    # The lookups are vectorized; each row is copied as is, so its keys and
+    # value types stay exactly as the caller passed them
+    return [
+        {**t, 'API_Category': c, 'API_Brand': b, 'API_Rating': r, 'API_Match': m}
+        for t, c, b, r, m in zip(transactions, category.tolist(), brand.tolist(),
+                                 rating.tolist(), matched.tolist())
+    ]
+
+
 def enrich_sales_data(transactions, product_mapping):
     """
     Enriches transaction data with API product information
@@ -94,6 +206,7 @@ def enrich_sales_data(transactions, product_mapping):
         'UnitPrice': 45000.0,
         'CustomerID': 'C001',
         'Region': 'North',
+        'Amount': 90000.0,
         # NEW FIELDS ADDED FROM API:
         'API_Category': 'laptops',
         'API_Brand': 'Apple',
@@ -112,31 +225,7 @@ def enrich_sales_data(transactions, product_mapping):
     - Use same pipe-delimited format
     - Include new columns in header
     """
-    enriched_transactions = []
-    for transaction in transactions:
-        enriched_transaction = transaction.copy()
-        product_id_str = transaction.get('ProductID', '')
-        try:
-            product_id = int(product_id_str.lstrip('P1'))
-            if product_id in product_mapping:
-                product_info = product_mapping[product_id]
-                enriched_transaction['API_Category'] = product_info['category']
-                enriched_transaction['API_Brand'] = product_info['brand']
-                enriched_transaction['API_Rating'] = product_info['rating']
-                enriched_transaction['API_Match'] = True
-            else:
-                enriched_transaction['API_Category'] = None
-                enriched_transaction['API_Brand'] = None
-                enriched_transaction['API_Rating'] = None
-                enriched_transaction['API_Match'] = False
-        except (ValueError, KeyError) as e:
-            print(f"Error processing ProductID '{product_id_str}': {e}")
-            enriched_transaction['API_Category'] = None
-            enriched_transaction['API_Brand'] = None
-            enriched_transaction['API_Rating'] = None
-            enriched_transaction['API_Match'] = False
-        
-        enriched_transactions.append(enriched_transaction)
+    enriched_transactions = _enrich_transactions(list(transactions), product_mapping)
 
     save_enriched_data(enriched_transactions, 'data/enriched_sales_data.txt')
     return enriched_transactions
@@ -146,9 +235,14 @@ def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data
     """
     Saves enriched transactions back to file
 
+    Parameters:
+    - enriched_transactions: list of enriched transaction dictionaries,
+      or the equivalent DataFrame
+    - filename: output path
+
     Expected File Format:
-    TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region|API_Category|API_Brand|API_Rating|API_Match
-    T001|2024-12-01|P101|Laptop|2|45000.0|C001|North|laptops|Apple|4.7|True
+    TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region|Amount|API_Category|API_Brand|API_Rating|API_Match
+    T001|2024-12-01|P101|Laptop|2|45000.0|C001|North|90000.0|laptops|Apple|4.7|True
     ...
 
     Requirements:
@@ -158,15 +252,39 @@ def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data
     """
 
     output_file = filename
-    with open(output_file, 'w', encoding='utf-8') as f:
-        headers = list(enriched_transactions[0].keys())
-        f.write('|'.join(headers) + '\n')
-        for transaction in enriched_transactions:
-            row = [str(transaction.get(header, '')) for header in headers]
-            f.write('|'.join(row) + '\n')
+    if isinstance(enriched_transactions, pd.DataFrame):
+        df = enriched_transactions
+        headers = list(df.columns)
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    else:
+        enriched_transactions = list(enriched_transactions)
+        # Rows may carry different keys; the header has every key, first seen first
+        headers = list(dict.fromkeys(chain.from_iterable(enriched_transactions)))
+        rows = (map(transaction.get, headers) for transaction in enriched_transactions)
+
+    _write_enriched_csv(headers, rows, output_file)
     print(f"Enriched data saved to {output_file}")
 
 
+def _write_enriched_csv(headers, rows, output_file):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter='|', lineterminator='\n',
+                        quoting=csv.QUOTE_NONE, quotechar=None, escapechar=_FIELD_ESCAPE)
+    writer.writerow(headers)
+    writer.writerows(rows)
+
+    # Values are written as is (None as an empty field), except that '|' and
+    # line breaks inside them become spaces, the way parse_transactions()
+    # replaces commas, so every line still splits into len(headers) fields
+    text = buffer.getvalue()
+    if _FIELD_ESCAPE in text or '\r' in text:
+        text = _ESCAPED_FIELD.sub(
+            lambda m: _FIELD_ESCAPE if m.group(1) == _FIELD_ESCAPE else ' ', text
+        )
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
 def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt'):
     """
     Generates a comprehensive formatted text report
@@ -233,100 +351,123 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
 
     (continue with all sections...)
     """
-    total_revenue = calculate_total_revenue(transactions)
+    # Convert once; every analytics call below reuses the same typed frame
+    sales_df = prepare_transactions(transactions)
+
+    total_revenue = calculate_total_revenue(sales_df)
     total_transactions = len(transactions)
     average_order_value = total_revenue / total_transactions
-    date_range = f"{min(t['Date'] for t in transactions)} to {max(t['Date'] for t in transactions)}"
-
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("============================================\n")
-        f.write("      SALES ANALYTICS REPORT\n")
-        f.write(f"     Generated: {pd.Timestamp.now()}\n")
-        f.write(f"     Records Processed: {total_transactions}\n")
-        f.write("============================================\n\n")
-
-        f.write("OVERALL SUMMARY\n")
-        f.write("--------------------------------------------\n")
-        f.write(f"Total Revenue:        ₹{total_revenue:,.2f}\n")
-        f.write(f"Total Transactions:   {total_transactions}\n")
-        f.write(f"Average Order Value:  ₹{average_order_value:,.2f}\n")
-        f.write(f"Date Range:           {date_range}\n\n")
+    first_date, last_date = sales_date_range(sales_df)
+    date_range = f"{first_date} to {last_date}"
+
+    # Each section is built as a list of lines and written with a single call
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        lines = [
+            "============================================",
+            "      SALES ANALYTICS REPORT",
+            f"     Generated: {pd.Timestamp.now()}",
+            f"     Records Processed: {total_transactions}",
+            "============================================",
+            "",
+            "OVERALL SUMMARY",
+            "--------------------------------------------",
+            f"Total Revenue:        ₹{total_revenue:,.2f}",
+            f"Total Transactions:   {total_transactions}",
+            f"Average Order Value:  ₹{average_order_value:,.2f}",
+            f"Date Range:           {date_range}",
+            "",
+        ]
+        f.write('\n'.join(lines) + '\n')
 
         # REGION-WISE PERFORMANCE.
-        region_sales = region_wise_sales(transactions)
-        f.write("REGION-WISE PERFORMANCE\n")
-        f.write("--------------------------------------------\n")
-        f.write(f"{'Region':<20} {'Sales':<20} {'% of Total':<15} {'Transactions':<15}\n")
+        region_sales = region_wise_sales(sales_df)
+        lines = [
+            "REGION-WISE PERFORMANCE",
+            "--------------------------------------------",
+            f"{'Region':<20} {'Sales':<20} {'% of Total':<15} {'Transactions':<15}",
+        ]
         for region, sales in region_sales.items():
             region_name = region if region else 'No region'
             sales_amount = f"₹{sales['total_sales']:,.2f}"
             percentage = f"{sales['percentage']:.2f}%"
             transaction_count = sales.get('transaction_count', 0)
-            f.write(f"{region_name:<20} {sales_amount:<20} {percentage:<15} {transaction_count:<15}\n")
-        f.write("\n")
+            lines.append(f"{region_name:<20} {sales_amount:<20} {percentage:<15} {transaction_count:<15}")
+        lines.append("")
+        f.write('\n'.join(lines) + '\n')
 
         # TOP 5 PRODUCTS
-        top_products = top_selling_products(transactions, 5)
-        f.write("TOP 5 PRODUCTS\n")
-        f.write("--------------------------------------------\n")
-        f.write(f"{'Rank':<5} {'Product Name':<30} {'Quantity Sold':<15} {'Revenue':<15}\n")
+        # One product aggregation serves both the top 5 and the low performers
+        top_products, low_performers = product_rankings(sales_df, n=5, threshold=14)
+        lines = [
+            "TOP 5 PRODUCTS",
+            "--------------------------------------------",
+            f"{'Rank':<5} {'Product Name':<30} {'Quantity Sold':<15} {'Revenue':<15}",
+        ]
         for rank,(productname, quantity, total_revenue) in enumerate(top_products, start=1):
-            f.write(f"{rank:<5} {productname:<30} {quantity:<15} ₹{total_revenue:,.2f}\n")
-        f.write("\n")
+            lines.append(f"{rank:<5} {productname:<30} {quantity:<15} ₹{total_revenue:,.2f}")
+        lines.append("")
+        f.write('\n'.join(lines) + '\n')
 
         # TOP 5 CUSTOMERS
-        customer_data = customer_analysis(transactions)
+        customer_data = customer_analysis(sales_df)
         top_customers = sorted(customer_data.items(), key=lambda x: x[1]['total_spent'], reverse=True)[:5]
-        f.write("TOP 5 CUSTOMERS\n")
-        f.write("--------------------------------------------\n")
-        f.write(f"{'Rank':<5} {'Customer ID':<20} {'Total Spent':<20} {'Order Count':<15}\n")
+        lines = [
+            "TOP 5 CUSTOMERS",
+            "--------------------------------------------",
+            f"{'Rank':<5} {'Customer ID':<20} {'Total Spent':<20} {'Order Count':<15}",
+        ]
         for rank, (customer_id, value) in enumerate(top_customers, start=1):
-            f.write(f"{rank:<5} {customer_id:<20} ₹{value['total_spent']:<20,.2f} {value['purchase_count']:<15}\n")
-        f.write("\n")
+            lines.append(f"{rank:<5} {customer_id:<20} ₹{value['total_spent']:<20,.2f} {value['purchase_count']:<15}")
+        lines.append("")
+        f.write('\n'.join(lines) + '\n')
 
 
         # DAILY SALES TREND
-        daily_trend = daily_sales_trend(transactions)
-        f.write("DAILY SALES TREND\n")
-        f.write("--------------------------------------------\n")
-        f.write(f"{'Date':<15} {'Revenue':<20} {'Transactions':<15} {'Unique Customers':<20}\n")
+        daily_trend = daily_sales_trend(sales_df)
+        lines = [
+            "DAILY SALES TREND",
+            "--------------------------------------------",
+            f"{'Date':<15} {'Revenue':<20} {'Transactions':<15} {'Unique Customers':<20}",
+        ]
         for date, data in daily_trend.items():
-            f.write(f"{date:<15} ₹{data['revenue']:<20,.2f} {data['transaction_count']:<15} {data['unique_customers']:<20}\n")
-        f.write("\n")
+            lines.append(f"{date:<15} ₹{data['revenue']:<20,.2f} {data['transaction_count']:<15} {data['unique_customers']:<20}")
+        lines.append("")
+        f.write('\n'.join(lines) + '\n')
 
         # 7. PRODUCT PERFORMANCE ANALYSIS
 
-        peak_day, max_revenue, _ = find_peak_sales_day(transactions)
-        low_performers = low_performing_products(transactions, threshold=14)
-        f.write("PRODUCT PERFORMANCE ANALYSIS\n")
-        f.write("--------------------------------------------\n")
-        f.write(f"Best Selling Day: {peak_day} with Revenue ₹{max_revenue:,.2f}\n")
+        peak_day, max_revenue, _ = find_peak_sales_day(sales_df)
+        lines = [
+            "PRODUCT PERFORMANCE ANALYSIS",
+            "--------------------------------------------",
+            f"Best Selling Day: {peak_day} with Revenue ₹{max_revenue:,.2f}",
+        ]
         if low_performers:
-            f.write("Low Performing Products (less than 14 days sold):\n")
-            for product in low_performers:
-                f.write(f" - {product}\n")
+            lines.append("Low Performing Products (less than 14 days sold):")
+            lines.extend(f" - {product}" for product in low_performers)
         else:
-            f.write("No low performing products.\n")
-        f.write("\n")
+            lines.append("No low performing products.")
+        lines.append("")
+        f.write('\n'.join(lines) + '\n')
 
         # API ENRICHMENT SUMMARY
+        enriched_transactions = enriched_transactions if enriched_transactions is not None else []
         total_enriched = len(enriched_transactions)
-        successful_enriched_products = []
-        failed_enriched_products = 0
-        for enriched_transaction in enriched_transactions:
-            if enriched_transaction.get('API_Match') == False:
-                failed_enriched_products += 1
-            else: 
-                successful_enriched_products.append(enriched_transaction.get('ProductID'))
-               
-        success_rate = (len(successful_enriched_products) / total_enriched) * 100 if total_enriched > 0 else 0
-        f.write("API ENRICHMENT SUMMARY\n")
-        f.write("--------------------------------------------\n")
-        f.write(f"Total Products Enriched: {total_enriched}\n")
-        f.write(f"Successful Enrichment Rate: {success_rate:.2f}%\n")
-        f.write("Products that couldn't be enriched:\n")
-        for product in successful_enriched_products:
-            f.write(f" - {product}\n")
+        matches = np.fromiter((bool(t.get('API_Match')) for t in enriched_transactions),
+                              dtype=bool, count=total_enriched)
+        success_rate = matches.mean() * 100 if total_enriched > 0 else 0
+        failed_enriched_products = list(dict.fromkeys(
+            t.get('ProductID') for t, matched in zip(enriched_transactions, matches) if not matched
+        ))
+        lines = [
+            "API ENRICHMENT SUMMARY",
+            "--------------------------------------------",
+            f"Total Products Enriched: {total_enriched}",
+            f"Successful Enrichment Rate: {success_rate:.2f}%",
+            "Products that couldn't be enriched:",
+        ]
+        lines.extend(f" - {product}" for product in failed_enriched_products)
+        f.write('\n'.join(lines) + '\n')
 
     print(f"Sales report generated and saved to {output_file}")
 
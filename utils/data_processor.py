@@ -1,3 +1,82 @@
+import numpy as np
+import pandas as pd
+
+
+_COLUMNS = ['TransactionID', 'Date', 'ProductID', 'ProductName',
+            'Quantity', 'UnitPrice', 'CustomerID', 'Region']
+
+# Low-cardinality keys are dictionary-encoded so groupby hashes integer codes.
+# file_handler.load_transactions() uses the same map, so its frames are prepared
+_CATEGORY_DTYPES = {'Region': 'category', 'ProductName': 'category', 'CustomerID': 'category'}
+
+
+def _to_frame(transactions):
+    """
+    Converts the list of transaction dictionaries (or a DataFrame from
+    load_transactions()) into a typed DataFrame
+
+    Returns: DataFrame with the transaction columns plus an 'Amount' column
+    (Quantity * UnitPrice, taken from the input when parse_transactions() or
+    load_transactions() already added it). Rows missing Quantity or
+    UnitPrice are dropped.
+
+    A DataFrame that is already in this form (from prepare_transactions())
+    is returned as is, without copying.
+    """
+    if _is_prepared(transactions):
+        return transactions
+
+    if isinstance(transactions, pd.DataFrame):
+        df = transactions.reindex(columns=_COLUMNS + ['Amount'])
+    else:
+        df = pd.DataFrame(list(transactions), columns=_COLUMNS + ['Amount'])
+    df = df.dropna(subset=['Quantity', 'UnitPrice']).reset_index(drop=True)
+    df['Quantity'] = df['Quantity'].astype('int64')
+    df['UnitPrice'] = df['UnitPrice'].astype('float64')
+    df = df.astype(_CATEGORY_DTYPES)
+
+    # Reuse the Amount computed at parse time; only fill it in when it's missing
+    if df['Amount'].isna().any():
+        df['Amount'] = df['Quantity'] * df['UnitPrice']
+    else:
+        df['Amount'] = df['Amount'].astype('float64')
+
+    return df
+
+
+def _is_prepared(transactions):
+    if not isinstance(transactions, pd.DataFrame):
+        return False
+    if list(transactions.columns) != _COLUMNS + ['Amount']:
+        return False
+    dtypes = transactions.dtypes
+    return (
+        dtypes['Quantity'] == 'int64' and
+        dtypes['UnitPrice'] == 'float64' and
+        dtypes['Amount'] == 'float64' and
+        all(isinstance(dtypes[column], pd.CategoricalDtype) for column in _CATEGORY_DTYPES)
+    )
+
+
+def _priced(transactions):
+    # The rows _to_frame() keeps, for the functions that skip building it
+    return [t for t in transactions
+            if t.get('Quantity') is not None and t.get('UnitPrice') is not None]
+
+
+def prepare_transactions(transactions):
+    """
+    Converts transactions once so several analytics functions can share them
+
+    Returns: typed DataFrame that every analytics function in this module
+    accepts in place of the list of transaction dictionaries
+
+    Build it after the transactions are final; it is a snapshot, so later
+    changes to the list are not reflected in it.
+    """
+    return _to_frame(transactions)
+
+
 def calculate_total_revenue(transactions):
     """
     Calculates total revenue from all transactions
@@ -6,16 +85,37 @@ def calculate_total_revenue(transactions):
 
     Expected Output: Single number representing sum of (Quantity * UnitPrice)
     Example: 1545000.50
+
+    A list is summed row by row without building the typed DataFrame;
+    prepare_transactions() output is summed from its Amount column.
     """
-    total_revenue = 0
-    for transaction in transactions:
-        try:
-            quantity = transaction['Quantity']
-            unit_price = transaction['UnitPrice']
-            total_revenue += quantity * unit_price
-        except KeyError:
-            continue
-    return total_revenue
+    if isinstance(transactions, pd.DataFrame):
+        return float(_to_frame(transactions)['Amount'].sum())
+    amounts = np.fromiter(
+        (t['Quantity'] * t['UnitPrice'] for t in _priced(transactions)),
+        dtype=np.float64
+    )
+    return float(amounts.sum())
+
+
+def sales_date_range(transactions):
+    """
+    Finds the first and last transaction dates
+
+    Returns: tuple (first_date, last_date), or (None, None) if there are no dates
+
+    Expected Output Format:
+    ('2024-12-01', '2024-12-31')
+
+    A list is scanned directly without building the typed DataFrame.
+    """
+    if isinstance(transactions, pd.DataFrame):
+        dates = _to_frame(transactions)['Date'].dropna().tolist()
+    else:
+        dates = [t['Date'] for t in _priced(transactions) if t.get('Date') is not None]
+    if not dates:
+        return (None, None)
+    return (min(dates), max(dates))
 
 
 def region_wise_sales(transactions):
@@ -40,37 +140,27 @@ def region_wise_sales(transactions):
     - Count transactions per region
     - Calculate percentage of total sales
     - Sort by total_sales in descending order
-    """
-
-    region_stats = {}
-    total_sales = 0
 
-    for transaction in transactions:
-        try:
-            region = transaction['Region']
-            sales_amount = transaction['Quantity'] * transaction['UnitPrice']
-        except KeyError:
-            continue
+    Pass prepare_transactions() output when calling several analytics
+    functions; a list is converted to a typed DataFrame on every call.
+    """
 
-        if region not in region_stats:
-            region_stats[region] = {
-                'total_sales': 0,
-                'transaction_count': 0
-            }
+    df = _to_frame(transactions).dropna(subset=['Region'])
 
-        total_sales += sales_amount
-        region_stats[region]['total_sales'] += sales_amount
-        region_stats[region]['transaction_count'] += 1
+    region_stats = df.groupby('Region', observed=True, sort=False)['Amount'].agg(
+        total_sales='sum',
+        transaction_count='count'
+    )
 
-    for region, stats in region_stats.items():
-        if total_sales > 0:
-            stats['percentage'] = round((stats['total_sales'] / total_sales) * 100, 2)
-        else:
-            stats['percentage'] = 0.0
+    total_sales = region_stats['total_sales'].sum()
+    if total_sales > 0:
+        region_stats['percentage'] = (region_stats['total_sales'] / total_sales * 100).round(2)
+    else:
+        region_stats['percentage'] = 0.0
 
-    sorted_region_stats = dict(sorted(region_stats.items(), key=lambda item: item[1]['total_sales'], reverse=True))
+    sorted_region_stats = region_stats.sort_values('total_sales', ascending=False, kind='stable')
 
-    return sorted_region_stats
+    return sorted_region_stats.to_dict('index')
 
 def top_selling_products(transactions, n=5):
     """
@@ -91,19 +181,11 @@ def top_selling_products(transactions, n=5):
     - Calculate total revenue for each product
     - Sort by TotalQuantity descending
     - Return top n products
-    """
-    product_stats = {}
-
-    get_product_stats(transactions, product_stats)
-
-    sorted_products = sorted(product_stats.items(), key=lambda item: item[1]['total_quantity'], reverse=True)
 
-    top_n_products = []
-
-    for product, stats in sorted_products[:n]:
-        top_n_products.append((product, stats['total_quantity'], stats['total_revenue']))
-
-    return top_n_products
+    Pass prepare_transactions() output when calling several analytics
+    functions; a list is converted to a typed DataFrame on every call.
+    """
+    return _top_n(_product_agg(transactions), n)
 
 
 
@@ -131,39 +213,28 @@ def customer_analysis(transactions):
     - Calculate average order value
     - List unique products bought
     - Sort by total_spent descending
-    """
-
-    customer_stats = {}
 
-    for transaction in transactions:
-        try:
-            customer_id = transaction['CustomerID']
-            product_name = transaction['ProductName']
-            amount_spent = transaction['Quantity'] * transaction['UnitPrice']
-        except KeyError:
-            continue
+    Pass prepare_transactions() output when calling several analytics
+    functions; a list is converted to a typed DataFrame on every call.
+    """
 
-        if customer_id not in customer_stats:
-            customer_stats[customer_id] = {
-                'total_spent': 0.0,
-                'purchase_count': 0,
-                'products_bought': set()
-            }
+    df = _to_frame(transactions).dropna(subset=['CustomerID', 'ProductName'])
 
-        customer_stats[customer_id]['total_spent'] += amount_spent
-        customer_stats[customer_id]['purchase_count'] += 1
-        customer_stats[customer_id]['products_bought'].add(product_name)
+    customer_stats = df.groupby('CustomerID', observed=True, sort=False)['Amount'].agg(
+        total_spent='sum',
+        purchase_count='count'
+    )
 
-    for customer_id, stats in customer_stats.items():
-        if stats['purchase_count'] > 0:
-            stats['avg_order_value'] = round(stats['total_spent'] / stats['purchase_count'], 2)
-        else:
-            stats['avg_order_value'] = 0.0
-        stats['products_bought'] = list(stats['products_bought'])
+    # De-duplicate (customer, product) pairs in one pass rather than per customer
+    unique_products = df[['CustomerID', 'ProductName']].drop_duplicates()
+    customer_stats['products_bought'] = unique_products['ProductName'].astype(object).groupby(
+        unique_products['CustomerID'], observed=True, sort=False
+    ).agg(list)
+    customer_stats['avg_order_value'] = (customer_stats['total_spent'] / customer_stats['purchase_count']).round(2)
 
-    sorted_customer_stats = dict(sorted(customer_stats.items(), key=lambda item: item[1]['total_spent'], reverse=True))
+    sorted_customer_stats = customer_stats.sort_values('total_spent', ascending=False, kind='stable')
 
-    return sorted_customer_stats
+    return sorted_customer_stats.to_dict('index')
 
 
 def daily_sales_trend(transactions):
@@ -189,36 +260,21 @@ def daily_sales_trend(transactions):
     - Count daily transactions
     - Count unique customers per day
     - Sort chronologically
-    """
-
-    date_stats = {}
-
-    for transaction in transactions:
-        try:
-            date = transaction['Date']
-            customer_id = transaction['CustomerID']
-            amount_spent = transaction['Quantity'] * transaction['UnitPrice']
-        except KeyError:
-            continue
 
-        if date not in date_stats:
-            date_stats[date] = {
-                'revenue': 0.0,
-                'transaction_count': 0,
-                'unique_customers': []
-            }
-
-        date_stats[date]['revenue'] += amount_spent
-        date_stats[date]['transaction_count'] += 1
-        date_stats[date]['unique_customers'].append(customer_id)
+    Pass prepare_transactions() output when calling several analytics
+    functions; a list is converted to a typed DataFrame on every call.
+    """
 
-    for date, stats in date_stats.items():
-        stats['unique_customers'] = len(set(stats['unique_customers']))
-        
+    df = _to_frame(transactions).dropna(subset=['Date', 'CustomerID'])
 
-    sorted_date_stats = dict(sorted(date_stats.items(), key=lambda item: item[0]))
+    # ISO dates sort chronologically as strings; nunique hashes each customer once per day
+    date_stats = df.groupby('Date', observed=True, sort=True).agg(
+        revenue=('Amount', 'sum'),
+        transaction_count=('Amount', 'size'),
+        unique_customers=('CustomerID', 'nunique')
+    )
 
-    return sorted_date_stats
+    return date_stats.to_dict('index')
 
 def find_peak_sales_day(transactions):
     """
@@ -228,18 +284,23 @@ def find_peak_sales_day(transactions):
 
     Expected Output Format:
     ('2024-12-15', 185000.0, 12)
+
+    Pass prepare_transactions() output when calling several analytics
+    functions; a list is converted to a typed DataFrame on every call.
     """
 
-    daily_stats = daily_sales_trend(transactions)
-    peak_day = None
-    max_revenue = 0.0
-    transaction_count = 0
+    df = _to_frame(transactions).dropna(subset=['Date'])
 
-    for date, stats in daily_stats.items():
-        if stats['revenue'] > max_revenue:
-            max_revenue = stats['revenue']
-            peak_day = date
-            transaction_count = stats['transaction_count']
+    # Integer-encode dates (sorted, so ties go to the earliest day) and reduce with bincount
+    codes, dates = pd.factorize(df['Date'], sort=True)
+    daily_revenue = np.bincount(codes, weights=df['Amount'].to_numpy(), minlength=len(dates))
+    if daily_revenue.size == 0 or daily_revenue.max() <= 0:
+        return (None, 0.0, 0)
+
+    peak = int(daily_revenue.argmax())
+    peak_day = dates[peak]
+    max_revenue = float(daily_revenue[peak])
+    transaction_count = int(np.count_nonzero(codes == peak))
 
     return (peak_day, max_revenue, transaction_count)
 
@@ -261,37 +322,48 @@ def low_performing_products(transactions, threshold=10):
     - Find products with total quantity < threshold
     - Include total quantity and revenue
     - Sort by TotalQuantity ascending
+
+    Pass prepare_transactions() output when calling several analytics
+    functions; a list is converted to a typed DataFrame on every call.
+    """
+
+    return _below_threshold(_product_agg(transactions), threshold)
+
+
+def product_rankings(transactions, n=5, threshold=10):
+    """
+    Finds top and low performing products from a single aggregation pass
+
+    Returns: tuple (top_selling_products(transactions, n),
+                    low_performing_products(transactions, threshold))
+
+    Pass prepare_transactions() output when calling several analytics
+    functions; a list is converted to a typed DataFrame on every call.
     """
+    product_stats = _product_agg(transactions)
+    return (_top_n(product_stats, n), _below_threshold(product_stats, threshold))
 
-    product_stats = {}
 
-    get_product_stats(transactions=transactions, product_stats=product_stats)
+def _top_n(product_stats, n):
+    top_n_products = product_stats.nlargest(n, 'total_quantity')
+    return list(top_n_products.itertuples(name=None))
 
-    low_performers = []
 
-    for product, stats in product_stats.items():
-        if stats['total_quantity'] < threshold:
-            low_performers.append((product, stats['total_quantity'], stats['total_revenue']))
+def _below_threshold(product_stats, threshold):
+    low_performers = product_stats[product_stats['total_quantity'] < threshold]
+    low_performers = low_performers.sort_values('total_quantity', kind='stable')
+    return list(low_performers.itertuples(name=None))
 
-    low_performers.sort(key=lambda x: x[1])
 
-    return low_performers
+def _product_agg(transactions):
+    # Total quantity and revenue per ProductName, in first-seen order
+    df = _to_frame(transactions).dropna(subset=['ProductName'])
+    return df.groupby('ProductName', observed=True, sort=False).agg(
+        total_quantity=('Quantity', 'sum'),
+        total_revenue=('Amount', 'sum')
+    )
 
 
 def get_product_stats(transactions, product_stats):
-    for transaction in transactions:
-        try:
-            product_name = transaction['ProductName']
-            quantity = transaction['Quantity']
-            unit_price = transaction['UnitPrice']
-        except KeyError:
-            continue
-
-        if product_name not in product_stats:
-            product_stats[product_name] = {
-                'total_quantity': 0,
-                'total_revenue': 0.0
-            }
-
-        product_stats[product_name]['total_quantity'] += quantity
-        product_stats[product_name]['total_revenue'] += quantity * unit_price
+    product_stats.update(_product_agg(transactions).to_dict('index'))
+    return product_stats
@@ -1,3 +1,12 @@
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+
+from utils.data_processor import _CATEGORY_DTYPES, _COLUMNS
+
+
 def read_sales_data(filename):
     """
     Reads sales data from file handling encoding issues
@@ -35,7 +44,7 @@ def parse_transactions(raw_lines):
 
     Returns: list of dictionaries with keys:
     ['TransactionID', 'Date', 'ProductID', 'ProductName',
-     'Quantity', 'UnitPrice', 'CustomerID', 'Region']
+     'Quantity', 'UnitPrice', 'CustomerID', 'Region', 'Amount']
 
     Expected Output Format:
     [
@@ -47,7 +56,8 @@ def parse_transactions(raw_lines):
             'Quantity': 2,           # int type
             'UnitPrice': 45000.0,    # float type
             'CustomerID': 'C001',
-            'Region': 'North'
+            'Region': 'North',
+            'Amount': 90000.0        # Quantity * UnitPrice
         },
         ...
     ]
@@ -58,13 +68,14 @@ def parse_transactions(raw_lines):
     - Remove commas from numeric fields and convert to proper types
     - Convert Quantity to int
     - Convert UnitPrice to float
+    - Add Amount (Quantity * UnitPrice) so analytics don't recompute it
     - Skip rows with incorrect number of fields
     """
 
     transactions = []
     for line in raw_lines:
         parts = line.strip().split('|')
-        if len(parts) != 8:
+        if len(parts) != len(_COLUMNS):
             continue
 
         transaction_id = parts[0]
@@ -87,19 +98,123 @@ def parse_transactions(raw_lines):
             'Quantity': quantity,
             'UnitPrice': unit_price,
             'CustomerID': customer_id,
-            'Region': region
+            'Region': region,
+            'Amount': quantity * unit_price
         }
         transactions.append(transaction)
 
     return transactions
 
 
+def load_transactions(filename):
+    """
+    Reads the sales data file straight into a DataFrame
+
+    Returns: DataFrame with the same columns and cleaning rules as
+    parse_transactions(), read in a single pass by the pandas C parser
+
+    Column types:
+    - Quantity: int64
+    - UnitPrice: float64
+    - Amount: float64 (Quantity * UnitPrice)
+    - Region, ProductName, CustomerID: category
+    - TransactionID: string
+    - all other columns: str
+
+    Requirements:
+    - Read with 'cp1252' encoding
+    - Skip the header row and empty lines
+    - Handle FileNotFoundError with appropriate error message
+    """
+
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        print(f"Error: The file {filename} was not found.")
+        return pd.DataFrame(columns=_COLUMNS + ['Amount'])
+
+    # Same line breaks as text mode, so line numbers match what read_csv counts
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+    df = pd.read_csv(
+        io.BytesIO(data),
+        sep='|',
+        header=None,
+        names=_COLUMNS,
+        skiprows=_lines_to_skip(data),
+        dtype=str,
+        encoding='cp1252',
+        quoting=csv.QUOTE_NONE,
+        keep_default_na=False,
+        engine='c'
+    )
+    # parse_transactions() strips each line before splitting it
+    df['TransactionID'] = df['TransactionID'].str.lstrip()
+    df['Region'] = df['Region'].str.rstrip()
+
+    df['ProductName'] = df['ProductName'].str.replace(',', ' ', regex=False)
+    quantity = _parse_numeric(df['Quantity'], integer=True)
+    unit_price = _parse_numeric(df['UnitPrice'], integer=False)
+
+    # Rows whose numeric fields don't parse are skipped, as with int()/float()
+    parsed = ~(np.isnan(quantity) | np.isnan(unit_price))
+    df = df[parsed].reset_index(drop=True)
+    df['Quantity'] = quantity[parsed].astype('int64')
+    df['UnitPrice'] = unit_price[parsed]
+    df['Amount'] = df['Quantity'] * df['UnitPrice']
+
+    return df.astype({'TransactionID': 'string', **_CATEGORY_DTYPES})
+
+
+def _parse_numeric(column, integer):
+    # Quantities and prices repeat heavily, so each distinct string is parsed
+    # once and the result spread back over the rows; NaN marks a parse failure
+    codes, uniques = pd.factorize(column)
+    text = pd.Series(uniques, dtype=object).str.replace(',', '', regex=False)
+    if integer:
+        text = text.str.strip()
+    values = pd.to_numeric(text, errors='coerce')
+    if integer:
+        # Quantity must be an integer literal ('1.0' is rejected like int() does)
+        # that fits in int64
+        values = values.where(
+            text.str.fullmatch(r'[+-]?\d+').fillna(False).astype(bool) &
+            values.abs().le(np.iinfo(np.int64).max)
+        )
+    return values.to_numpy(dtype='float64')[codes]
+
+
+def _lines_to_skip(data):
+    # Line numbers for read_csv to skip: the header (first non-blank line) and
+    # every line without exactly len(_COLUMNS) fields. A short row can't be told
+    # from one with empty trailing fields once parsed, so fields are counted
+    # here, on the raw bytes ('|' and '\n' are single bytes in cp1252)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    line_ends = np.flatnonzero(buf == ord('\n'))
+    if not data.endswith(b'\n'):
+        line_ends = np.append(line_ends, len(buf))
+    pipes = np.flatnonzero(buf == ord('|'))
+    fields = np.diff(np.searchsorted(pipes, line_ends), prepend=0) + 1
+
+    skip = set(np.flatnonzero(fields != len(_COLUMNS)).tolist())
+    start = 0
+    for line_number, end in enumerate(line_ends.tolist()):
+        if data[start:end].strip():
+            skip.add(line_number)
+            break
+        start = end + 1
+    return skip
+
+
 def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
     """
     Validates transactions and applies optional filters
 
     Parameters:
-    - transactions: list of transaction dictionaries
+    - transactions: list of transaction dictionaries, or a DataFrame
+      from load_transactions() (a DataFrame is returned in that case)
     - region: filter by specific region (optional)
     - min_amount: minimum transaction amount (Quantity * UnitPrice) (optional)
     - max_amount: maximum transaction amount (optional)
@@ -132,17 +247,21 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     - Print transaction amount range (min/max) to user
     - Show count of records after each filter applied
     """
-    valid_transactions = []
-    invalid_count = 0
+    is_frame = isinstance(transactions, pd.DataFrame)
+    if not is_frame:
+        transactions = list(transactions)
+    df = transactions if is_frame else pd.DataFrame(transactions, dtype=object)
+    df = df.reindex(columns=list(df.columns) + [c for c in _COLUMNS if c not in df])
+
     filter_summary = {
-        'total_input': len(transactions),
-        'invalid': invalid_count,
+        'total_input': len(df),
+        'invalid': 0,
         'filtered_by_region': 0,
         'filtered_by_amount': 0,
         'final_count': 0
     }
 
-    invalid_count, valid_transactions = get_valid_transaction(transactions=transactions)
+    invalid_count, valid_transactions = get_valid_transaction(transactions=df)
 
     filter_summary['invalid'] = invalid_count
 
@@ -157,47 +276,49 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
 
     filter_summary['final_count'] = len(valid_transactions)
 
+    if not is_frame:
+        # The frame has a RangeIndex, so the surviving labels are list positions;
+        # hand back the caller's own dictionaries rather than rebuilt ones
+        keep = df.index.isin(valid_transactions.index)
+        valid_transactions = [t for t, ok in zip(transactions, keep) if ok]
+
     return valid_transactions, invalid_count, filter_summary
 
 
 
 def get_trnsaction_by_region(region, valid_transactions):
-    region_transaction = []
-    for valid_transaction in valid_transactions:
-        if valid_transaction['Region'] == region:
-            region_transaction.append(valid_transaction)
-    return region_transaction
+    return valid_transactions[valid_transactions['Region'].eq(region)]
+
+
+def _first_char(column):
+    # Casting to a 1-char fixed-width array keeps only the prefix, so the ID
+    # checks become plain array comparisons instead of per-row startswith()
+    return np.asarray(column, dtype=object).astype('<U1')
 
 
 def get_valid_transaction(transactions):
-    valid_transactions = []
-    invalid_count = 0
-    for transaction in transactions:
-        try:
-            if (transaction['Quantity'] <= 0 or
-                transaction['UnitPrice'] <= 0 or
-                not transaction['ProductID'].startswith('P') or
-                not transaction['TransactionID'].startswith('T') or
-                not transaction['CustomerID'].startswith('C')):
-                invalid_count += 1
-                continue
-        except KeyError:
-            invalid_count += 1
-            continue
-        valid_transactions.append(transaction)
-    return invalid_count, valid_transactions
+    df = transactions
+    mask = (
+        df[_COLUMNS].notna().all(axis=1) &
+        (pd.to_numeric(df['Quantity'], errors='coerce') > 0) &
+        (pd.to_numeric(df['UnitPrice'], errors='coerce') > 0) &
+        (_first_char(df['ProductID']) == 'P') &
+        (_first_char(df['TransactionID']) == 'T') &
+        (_first_char(df['CustomerID']) == 'C')
+    )
+    invalid_count = int((~mask).sum())
+    return invalid_count, transactions[mask]
 
 def get_transaction_by_amout(min_amount, max_amount, valid_transactions, filter_summary):
     before_count = len(valid_transactions)
-    filter_by_amount = []
-    for transaction in valid_transactions:
-        amount = transaction['Quantity'] * transaction['UnitPrice']
-        if min_amount is not None and amount < min_amount:
-            continue
-        if max_amount is not None and amount > max_amount:
-            continue
-        filter_by_amount.append(transaction)
-
-    valid_transactions = filter_by_amount
+    if 'Amount' in valid_transactions and valid_transactions['Amount'].notna().all():
+        amount = pd.to_numeric(valid_transactions['Amount'])
+    else:
+        amount = (pd.to_numeric(valid_transactions['Quantity']) *
+                  pd.to_numeric(valid_transactions['UnitPrice']))
+    lo = min_amount if min_amount is not None else -float('inf')
+    hi = max_amount if max_amount is not None else float('inf')
+
+    valid_transactions = valid_transactions[amount.between(lo, hi, inclusive='both')]
     filter_summary['filtered_by_amount'] = before_count - len(valid_transactions)
     return valid_transactions